@@ -0,0 +1,84 @@
+"""On-disk cache of COA extraction results for batch runs."""
+
+import hashlib
+import logging
+import os
+import shelve
+from dataclasses import astuple
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "coa_analyzer")
+CACHE_FILE = os.path.join(CACHE_DIR, "results.db")
+
+# Version of the cached data. Bump this with any change to extract_coa_data or
+# extract_metadata that alters their output, so stale entries stop matching
+CACHE_SCHEMA = 2
+
+# Only the head of the file is hashed; size and mtime catch edits further in
+HASH_BYTES = 65536
+
+
+def cache_key(file_path: str, settings: str = "") -> str:
+    """Build a cache key from the file's leading bytes, size and mtime.
+    
+    settings names the extraction options that affect the results (such as
+    the OCR resolution), so changing them misses the cache.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(HASH_BYTES)
+        stat = os.fstat(f.fileno())
+    digest = hashlib.blake2b(head + str(stat.st_size).encode()).hexdigest()
+    return f"{CACHE_SCHEMA}:{settings}:{digest}:{stat.st_mtime_ns}"
+
+
+class ResultCache:
+    """Shelve-backed store of (results, metadata) keyed by file content.
+
+    Results are stored as plain tuples and rebuilt with the caller's
+    TestResult class, so entries do not depend on where that class lives.
+    """
+
+    def __init__(self, result_type: type, path: str = CACHE_FILE, settings: str = ""):
+        self.result_type = result_type
+        self.path = path
+        self.settings = settings
+        self._db = None
+
+    def __enter__(self) -> "ResultCache":
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = shelve.open(self.path)
+        except Exception as e:
+            # A broken cache only costs speed; carry on without it
+            logger.warning(f"Result cache unavailable ({e}), continuing without it")
+            self._db = None
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get(self, file_path: str) -> Optional[Tuple[List, Dict[str, str]]]:
+        """Return cached (results, metadata) for the file, or None on a miss."""
+        if self._db is None:
+            return None
+        try:
+            rows, metadata = self._db[cache_key(file_path, self.settings)]
+        except KeyError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry for {os.path.basename(file_path)}: {e}")
+            return None
+        return [self.result_type(*row) for row in rows], metadata
+
+    def put(self, file_path: str, results: List, metadata: Dict[str, str]) -> None:
+        """Store the extraction output for the file."""
+        if self._db is None:
+            return
+        try:
+            self._db[cache_key(file_path, self.settings)] = ([astuple(r) for r in results], dict(metadata))
+        except Exception as e:
+            logger.warning(f"Could not cache results for {os.path.basename(file_path)}: {e}")
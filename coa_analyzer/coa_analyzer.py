@@ -6,6 +6,7 @@ import logging
 import traceback
 import gc
 import psutil
+from collections import Counter
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QPushButton, QTextEdit, 
                            QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView)
@@ -429,8 +430,8 @@ class COAAnalyzer(QMainWindow):
             base_filename = os.path.basename(self.current_file) if self.current_file else "No file"
             
             # Count results
-            passes = sum(1 for r in self.results if r.result == "PASS")
-            fails = sum(1 for r in self.results if r.result == "FAIL")
+            counts = Counter(r.result for r in self.results)
+            passes, fails = counts["PASS"], counts["FAIL"]
             
             # Get metadata
             material = self.metadata.get("Material", "").split()[0] if self.metadata.get("Material") else "N/A"
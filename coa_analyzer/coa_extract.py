@@ -4,8 +4,17 @@ import argparse
 import csv
 import os
 import logging
+import mmap
+import multiprocessing
 import subprocess
+import threading
+import queue
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, zip_longest
 from typing import List, Optional, Tuple, Dict
 
 # Third-party imports
@@ -27,20 +36,44 @@ except ImportError:
     print("Error: pytesseract package not found. Please install it using 'pip install pytesseract'")
     sys.exit(1)
 
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Also runnable as a plain script, where the package itself is not importable
+if __package__:
+    from .cache import ResultCache
+else:
+    from cache import ResultCache
+
+# Batch worker processes, which already run one per core. Workers started with
+# spawn (the default on Windows) re-import this module; they leave the log file
+# and tool lookup to the parent, and _init_batch_worker sets them up
+_batch_worker = multiprocessing.current_process().name != 'MainProcess'
 
 # Create logs directory in user's AppData folder
 log_dir = os.path.join(os.path.expanduser('~'), 'AppData', 'Local', 'COA_Analyzer', 'logs')
 os.makedirs(log_dir, exist_ok=True)
 
-# Set up logging
+# Set up logging; debug output is opt-in via the COA_DEBUG environment variable
+# and only goes to the console, the log file is capped at INFO
+debug_enabled = bool(os.environ.get('COA_DEBUG'))
+
+stream_handler = logging.StreamHandler()
+stream_handler.setLevel(logging.DEBUG if debug_enabled else logging.INFO)
+
+log_handlers: List[logging.Handler] = [stream_handler]
+if not _batch_worker:
+    file_handler = RotatingFileHandler(
+        os.path.join(log_dir, 'coa_processing.log'),
+        maxBytes=5_000_000,
+        backupCount=2
+    )
+    file_handler.setLevel(logging.INFO)
+    log_handlers.append(file_handler)
+
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.DEBUG if debug_enabled else logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(os.path.join(log_dir, 'coa_processing.log'), mode='w')
-    ]
+    handlers=log_handlers
 )
 logger = logging.getLogger(__name__)
 
@@ -50,7 +83,7 @@ def find_tesseract():
     # Hardcoded paths for target machine
     target_machine_path = r'C:\Users\calyn-furr\AppData\local\Programs\Tesseract-OCR'
     if os.path.exists(os.path.join(target_machine_path, 'tesseract.exe')):
-        logger.debug(f"Found Tesseract at hardcoded path: {target_machine_path}")
+        logger.debug("Found Tesseract at hardcoded path: %s", target_machine_path)
         return target_machine_path
 
     # Check common installation paths as fallback
@@ -63,7 +96,7 @@ def find_tesseract():
     
     for path in possible_paths:
         if os.path.exists(os.path.join(path, 'tesseract.exe')):
-            logger.debug(f"Found Tesseract at: {path}")
+            logger.debug("Found Tesseract at: %s", path)
             return path
     
     # Check if it's in PATH
@@ -71,10 +104,10 @@ def find_tesseract():
         result = subprocess.run(['where', 'tesseract'], capture_output=True, text=True)
         if result.returncode == 0:
             tesseract_path = os.path.dirname(result.stdout.strip())
-            logger.debug(f"Found Tesseract in PATH: {tesseract_path}")
+            logger.debug("Found Tesseract in PATH: %s", tesseract_path)
             return tesseract_path
     except Exception as e:
-        logger.debug(f"Could not check Tesseract in PATH: {e}")
+        logger.debug("Could not check Tesseract in PATH: %s", e)
     
     logger.warning("Tesseract OCR not found. Please install from https://github.com/UB-Mannheim/tesseract/wiki")
     return None
@@ -86,13 +119,13 @@ def find_poppler():
     target_machine_path = r'C:\Users\calyn-furr\Downloads\Release\24.08.0-0'
     poppler_bin_path = os.path.join(target_machine_path, 'bin')
     if os.path.exists(poppler_bin_path) and os.path.exists(os.path.join(poppler_bin_path, 'pdftoppm.exe')):
-        logger.debug(f"Found Poppler at hardcoded path: {poppler_bin_path}")
+        logger.debug("Found Poppler at hardcoded path: %s", poppler_bin_path)
         return poppler_bin_path
     
     # Also check library/bin structure for the hardcoded path
     poppler_lib_bin_path = os.path.join(target_machine_path, 'Library', 'bin')
     if os.path.exists(poppler_lib_bin_path) and os.path.exists(os.path.join(poppler_lib_bin_path, 'pdftoppm.exe')):
-        logger.debug(f"Found Poppler at hardcoded path: {poppler_lib_bin_path}")
+        logger.debug("Found Poppler at hardcoded path: %s", poppler_lib_bin_path)
         return poppler_lib_bin_path
 
     # Check common installation paths as fallback
@@ -110,7 +143,7 @@ def find_poppler():
                         if os.path.exists(poppler_path):
                             possible_paths.append(poppler_path)
             except Exception as e:
-                logger.debug(f"Error searching in {base_path}: {e}")
+                logger.debug("Error searching in %s: %s", base_path, e)
     
     # Add other common locations
     possible_paths.extend([
@@ -124,7 +157,7 @@ def find_poppler():
     
     for path in possible_paths:
         if os.path.exists(os.path.join(path, 'pdftoppm.exe')):
-            logger.debug(f"Found Poppler at: {path}")
+            logger.debug("Found Poppler at: %s", path)
             return path
     
     # Check if it's in PATH
@@ -132,23 +165,35 @@ def find_poppler():
         result = subprocess.run(['where', 'pdftoppm'], capture_output=True, text=True)
         if result.returncode == 0:
             poppler_path = os.path.dirname(result.stdout.strip())
-            logger.debug(f"Found Poppler in PATH: {poppler_path}")
+            logger.debug("Found Poppler in PATH: %s", poppler_path)
             return poppler_path
     except Exception as e:
-        logger.debug(f"Could not check Poppler in PATH: {e}")
+        logger.debug("Could not check Poppler in PATH: %s", e)
     
     logger.warning("Poppler not found. Please install from https://github.com/oschwartz10612/poppler-windows/releases/")
     return None
 
-# Find paths at module load time
-tesseract_path = find_tesseract()
-poppler_path = find_poppler()
+# Find paths at module load time; batch workers are given the parent's
+tesseract_path = None if _batch_worker else find_tesseract()
+poppler_path = None if _batch_worker else find_poppler()
 
 # Configure pytesseract with Tesseract path if found
 if tesseract_path:
     pytesseract.pytesseract.tesseract_cmd = os.path.join(tesseract_path, 'tesseract.exe')
 
-@dataclass
+# Resolution used when rasterizing pages for OCR; scanned-only documents can
+# bump this (e.g. COA_OCR_DPI=300) if the default is too coarse
+try:
+    OCR_DPI = int(os.environ.get('COA_OCR_DPI', '150'))
+except ValueError:
+    logger.warning("Invalid COA_OCR_DPI value, falling back to 150")
+    OCR_DPI = 150
+
+# dataclass(slots=...) needs Python 3.10; older interpreters get a regular class
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class TestResult:
     name: str
     method: str
@@ -158,6 +203,7 @@ class TestResult:
     result: str  # PASS or FAIL
 
 
+@lru_cache(maxsize=1024)
 def parse_specification(spec_str: str) -> Tuple[Optional[float], Optional[float]]:
     """Parse specification string into min and max values."""
     if not spec_str or spec_str == "N/A":
@@ -184,34 +230,46 @@ def parse_specification(spec_str: str) -> Tuple[Optional[float], Optional[float]
 
 def evaluate_result(value_str: str, spec_str: str) -> str:
     """Evaluate if a value passes the specification."""
-    if not value_str or not spec_str:
+    if not value_str or not spec_str or spec_str == "N/A":
         return "UNKNOWN"  # Can't evaluate without value or specification
+    
+    # Check the (cached) specification first so unparseable specs skip the value work
+    try:
+        min_val, max_val = parse_specification(spec_str)
+    except Exception as e:
+        logger.error(f"Error evaluating result for value '{value_str}' with spec '{spec_str}': {str(e)}", exc_info=True)
+        return "UNKNOWN"
+    
+    if min_val is None and max_val is None:
+        logger.debug("Specification '%s' could not be parsed into min/max values", spec_str)
+        return "UNKNOWN"  # Can't evaluate without specification
         
     try:
         # Clean and normalize value string
         value_str = value_str.strip().replace(',', '')
         value = float(value_str)
     except (ValueError, TypeError) as e:
-        logger.debug(f"Could not convert value '{value_str}' to float: {str(e)}")
+        logger.debug("Could not convert value '%s' to float: %s", value_str, e)
         return "UNKNOWN"  # Non-numeric values can't be evaluated
     
-    try:
-        min_val, max_val = parse_specification(spec_str)
-        
-        if min_val is not None and value < min_val:
-            return "FAIL"
-        if max_val is not None and value > max_val:
-            return "FAIL"
-        if (min_val is None and max_val is None):
-            logger.debug(f"Specification '{spec_str}' could not be parsed into min/max values")
-            return "UNKNOWN"  # Can't evaluate without specification
-    except Exception as e:
-        logger.error(f"Error evaluating result for value '{value_str}' with spec '{spec_str}': {str(e)}", exc_info=True)
-        return "UNKNOWN"
+    if min_val is not None and value < min_val:
+        return "FAIL"
+    if max_val is not None and value > max_val:
+        return "FAIL"
     
     return "PASS"
 
 
+# Validators for each column of the test results table
+_VALIDATORS = {
+    "names": re.compile(r"^[A-Za-z0-9']"),
+    "methods": re.compile(r'^N200\.\d+'),
+    "units": re.compile(r'^(?:dNm|min\.?|%)$'),
+    "values": re.compile(r'^\d+\.?\d*$'),
+    "specs": re.compile(r'[=<>-]'),
+}
+
+
 def extract_coa_data(raw_text: str) -> List[TestResult]:
     """Extract test data from COA text."""
     if not raw_text:
@@ -221,7 +279,7 @@ def extract_coa_data(raw_text: str) -> List[TestResult]:
     try:
         lines = raw_text.strip().split('\n')
         results = []
-        seen_test_results = set()  # Track unique test results
+        seen_test_results: set[tuple[str, str, str, str]] = set()  # Track unique test results
         
         # Safety check for very large input
         if len(lines) > 10000:
@@ -250,12 +308,8 @@ def extract_coa_data(raw_text: str) -> List[TestResult]:
         for start_idx, end_idx in coa_sections:
             section_lines = lines[start_idx:end_idx]
             
-            # Find the test results section
-            test_names = []
-            test_methods = []
-            units = []
-            values = []
-            specs = []
+            # Column values collected for each table section
+            cols = {"names": [], "methods": [], "units": [], "values": [], "specs": []}
             
             # Current section being read
             current_section = None
@@ -288,41 +342,32 @@ def extract_coa_data(raw_text: str) -> List[TestResult]:
                         current_section = "specs"
                         continue
                         
-                    # Add data to appropriate list if it looks valid
-                    if current_section == "names" and re.match(r'^[A-Za-z0-9\']+', line):
-                        if line not in ["DATE OF PRODUCTION", "COUNTRY OF ORIGIN"]:
-                            test_names.append(line)
-                    elif current_section == "methods" and re.match(r'^N200\.\d+', line):
-                        test_methods.append(line)
-                    elif current_section == "units" and line in ["dNm", "min.", "%", "min"]:
-                        units.append(line)
-                    elif current_section == "values" and re.match(r'^\d+\.?\d*$', line):
-                        values.append(line)
-                    elif current_section == "specs" and ("=" in line or "-" in line or any(x in line for x in ["<", ">"])):
-                        specs.append(line)
+                    # Add data to the current column if it looks valid
+                    if current_section in _VALIDATORS and _VALIDATORS[current_section].search(line):
+                        if current_section == "names" and line in ["DATE OF PRODUCTION", "COUNTRY OF ORIGIN"]:
+                            continue
+                        cols[current_section].append(line)
                 except Exception as line_error:
                     logger.error(f"Error processing line '{line}': {str(line_error)}")
                     continue
             
-            # Create test results from the collected data
-            for i in range(len(test_names)):
+            # Create test results from the collected columns
+            rows = zip_longest(
+                cols["names"], cols["methods"], cols["units"], cols["values"], cols["specs"],
+                fillvalue=""
+            )
+            for i, (name, method, unit, value, spec) in enumerate(rows):
                 try:
-                    name = test_names[i]
-                    method = test_methods[i] if i < len(test_methods) else ""
-                    unit = units[i] if i < len(units) else ""
-                    value = values[i] if i < len(values) else ""
-                    spec = specs[i] if i < len(specs) else ""
+                    # Rows past the last test name are leftovers from other columns
+                    if not name:
+                        break
                     
                     # Skip non-test entries
                     if name in ["DATE OF PRODUCTION", "COUNTRY OF ORIGIN"]:
                         continue
-                        
-                    # Handle special cases
-                    if name == "ML100" and not unit:
-                        unit = ""  # ML100 typically has no unit
                     
                     # Create unique key for this test result
-                    result_key = f"{name}_{method}_{value}_{spec}"
+                    result_key = (name, method, value, spec)
                     if result_key in seen_test_results:
                         continue
                     
@@ -348,6 +393,48 @@ def extract_coa_data(raw_text: str) -> List[TestResult]:
         return []
 
 
+_MATERIAL_PATTERN = re.compile(r'Material:?\s*([A-Z0-9]+\s+[A-Z0-9\s]+(?:CHP|GRT|GNA)\s+[A-Z0-9\s]+)')
+_REFERENCE_PATTERN = re.compile(r'(?:Reference No:|CPN:|Sales Order No\.|Order No\.?)\s*([A-Z0-9]+)')
+
+# Batch number formats. Each alternative has exactly one capturing group, so
+# the matched one is found via match.lastindex. The list order only breaks ties
+# between formats matching at the same position.
+_BATCH_PATTERNS = [
+    r'(?i:(?:Batch|Lot|Batch No\.?|Batch Number)\s*[:.]?\s*([0-9A-Z]+(?:[A-Z][0-9]+)?))',
+    r'(?i:(?:Batch|Lot)\s*ID\s*[:.]?\s*([0-9A-Z]+(?:[A-Z][0-9]+)?))',
+    r'^\s*([0-9]{6}[A-Z][0-9]{3})\s*$',  # Format like: 241226D257
+    r'(?i:(?:Batch|Lot)\s*#\s*[:.]?\s*([0-9A-Z]+(?:[A-Z][0-9]+)?))',
+    r'(?i:(?:Batch|Lot)\s*:\s*([0-9A-Z]+(?:[A-Z][0-9]+)?))',
+    r'(?i:(?:Batch|Lot)\s*=\s*([0-9A-Z]+(?:[A-Z][0-9]+)?))',
+    r'(?i:Batch\s+([0-9]{6}[A-Z][0-9]{3})\s+[0-9,]+\s*/LB)',  # Format from delivery note
+    r'(?i:Batch\s+([0-9]{6}[A-Z][0-9]{3}))',  # Simpler delivery note format
+    r'(?i:Batch\s*\n\s*([0-9]{6}[A-Z][0-9]{3}))',  # Format with newline
+    r'(?i:Batch\s*\n\s*([0-9A-Z]+))',  # Generic format with newline
+    r'(?i:(?:Batch|Lot)\s*\n\s*([0-9]{6}[A-Z][0-9]{3})\s*\n)',  # OCR format with newlines
+    r'(?i:(?:Batch|Lot)\s*\n\s*([0-9A-Z]+)\s*\n)',  # Generic OCR format with newlines
+    r'(?i:(?:Batch|Lot)\s*\n([0-9]{6}[A-Z][0-9]{3}))',  # OCR format with single newline
+    r'(?i:(?:Batch|Lot)\s*\n([0-9A-Z]+))',  # Generic OCR format with single newline
+]
+_BATCH_COMBINED = re.compile('|'.join(_BATCH_PATTERNS), re.MULTILINE)
+_BATCH_STANDALONE = re.compile(r'^[0-9]{6}[A-Z][0-9]{3}$')
+# Gap between table columns (two or more spaces)
+_COLUMN_GAP_PATTERN = re.compile(r'\s{2,}')
+
+
+def _find_batch(text: str, max_breaks: int) -> Optional[re.Match]:
+    """Return the leftmost batch match spanning at most max_breaks line breaks.
+    
+    The multi-line formats' whitespace can otherwise run over any number of
+    blank lines and pick up an unrelated word further down the page.
+    """
+    pos = 0
+    while batch_match := _BATCH_COMBINED.search(text, pos):
+        if batch_match.group(0).count('\n') <= max_breaks:
+            return batch_match
+        pos = batch_match.start() + 1
+    return None
+
+
 def extract_metadata(raw_text: str) -> Dict[str, str]:
     """Extract metadata from the COA text."""
     if not raw_text:
@@ -363,113 +450,57 @@ def extract_metadata(raw_text: str) -> Dict[str, str]:
             logger.warning(f"Input text is very large ({len(lines)} lines), truncating to first 10000 lines")
             lines = lines[:10000]
         
-        # Extract material information
-        try:
-            material_pattern = re.compile(r'Material:?\s*([A-Z0-9]+\s+[A-Z0-9\s]+(?:CHP|GRT|GNA)\s+[A-Z0-9\s]+)')
-            reference_pattern = re.compile(r'(?:Reference No:|CPN:|Sales Order No\.|Order No\.?)\s*([A-Z0-9]+)')
-        except re.error as pattern_error:
-            logger.error(f"Error compiling regex pattern: {str(pattern_error)}")
-            material_pattern = re.compile(r'Material:?\s*(\S+)')
-            reference_pattern = re.compile(r'Reference No:\s*(\S+)')
-        
-        # Enhanced batch pattern to handle more formats - compile with error handling
-        batch_patterns = []
-        try:
-            batch_patterns = [
-                re.compile(r'(?:Batch|Lot|Batch No\.?|Batch Number)\s*[:.]?\s*([0-9A-Z]+(?:[A-Z][0-9]+)?)', re.IGNORECASE),
-                re.compile(r'(?:Batch|Lot)\s*ID\s*[:.]?\s*([0-9A-Z]+(?:[A-Z][0-9]+)?)', re.IGNORECASE),
-                re.compile(r'^\s*([0-9]{6}[A-Z][0-9]{3})\s*$'),  # Format like: 241226D257
-                re.compile(r'(?:Batch|Lot)\s*#\s*[:.]?\s*([0-9A-Z]+(?:[A-Z][0-9]+)?)', re.IGNORECASE),
-                re.compile(r'(?:Batch|Lot)\s*:\s*([0-9A-Z]+(?:[A-Z][0-9]+)?)', re.IGNORECASE),
-                re.compile(r'(?:Batch|Lot)\s*=\s*([0-9A-Z]+(?:[A-Z][0-9]+)?)', re.IGNORECASE),
-                re.compile(r'Batch\s+([0-9]{6}[A-Z][0-9]{3})\s+[0-9,]+\s*/LB', re.IGNORECASE),  # Format from delivery note
-                re.compile(r'Batch\s+([0-9]{6}[A-Z][0-9]{3})', re.IGNORECASE),  # Simpler delivery note format
-                re.compile(r'Batch\s*\n\s*([0-9]{6}[A-Z][0-9]{3})', re.IGNORECASE),  # Format with newline
-                re.compile(r'Batch\s*\n\s*([0-9A-Z]+)', re.IGNORECASE),  # Generic format with newline
-                re.compile(r'(?:Batch|Lot)\s*\n\s*([0-9]{6}[A-Z][0-9]{3})\s*\n', re.IGNORECASE),  # OCR format with newlines
-                re.compile(r'(?:Batch|Lot)\s*\n\s*([0-9A-Z]+)\s*\n', re.IGNORECASE),  # Generic OCR format with newlines
-                re.compile(r'(?:Batch|Lot)\s*\n([0-9]{6}[A-Z][0-9]{3})', re.IGNORECASE),  # OCR format with single newline
-                re.compile(r'(?:Batch|Lot)\s*\n([0-9A-Z]+)', re.IGNORECASE)  # Generic OCR format with single newline
-            ]
-        except re.error as pattern_error:
-            logger.error(f"Error compiling batch pattern: {str(pattern_error)}")
-            # Use simpler patterns as fallback
-            batch_patterns = [
-                re.compile(r'Batch\s*[:.]?\s*([0-9A-Z]+)', re.IGNORECASE),
-                re.compile(r'Lot\s*[:.]?\s*([0-9A-Z]+)', re.IGNORECASE)
-            ]
-        
         batch_found = False
         logger.debug("Starting metadata extraction...")
-        logger.debug(f"Total lines to process: {len(lines)}")
+        logger.debug("Total lines to process: %d", len(lines))
         
-        # First pass: look for batch number in standard format
+        # Look for the batch number with a single scan over the whole text; the
+        # leftmost match within three consecutive lines wins, and text shorter
+        # than that is only matched within single lines
+        text = '\n'.join(lines)
+        batch_line = -1
+        batch_match = _find_batch(text, 2 if len(lines) >= 3 else 0)
+        # Every alternative has a capturing group, so lastindex is set on a match
+        if batch_match and (batch_group := batch_match.lastindex) is not None:
+            batch_value = batch_match.group(batch_group).strip()
+            batch_line = text.count('\n', 0, batch_match.start())
+            batch_found = True
+            logger.debug("Found batch number using pattern %d: %s", batch_group - 1, batch_value)
+        
+        # First pass: look for the remaining metadata line by line
         for i, line in enumerate(lines):
             try:
-                logger.debug(f"\nProcessing line {i}: '{line}'")
+                logger.debug("\nProcessing line %d: '%s'", i, line)
+                
+                # Record the batch number in document order
+                if i == batch_line:
+                    metadata["Batch"] = batch_value
                 
                 # Look for material info
-                if material_match := material_pattern.search(line):
+                if material_match := _MATERIAL_PATTERN.search(line):
                     metadata["Material"] = material_match.group(1).strip()
-                    logger.debug(f"Found material: {metadata['Material']}")
+                    logger.debug("Found material: %s", metadata['Material'])
                     continue
                 
                 # Look for reference number
-                if reference_match := reference_pattern.search(line):
+                if reference_match := _REFERENCE_PATTERN.search(line):
                     metadata["Reference"] = reference_match.group(1).strip()
-                    logger.debug(f"Found reference: {metadata['Reference']}")
+                    logger.debug("Found reference: %s", metadata['Reference'])
                     continue
                 
-                # Try all batch patterns
-                if not batch_found:
-                    # Try single line patterns
-                    for pattern_idx, pattern in enumerate(batch_patterns):
-                        try:
-                            if batch_match := pattern.search(line):
-                                metadata["Batch"] = batch_match.group(1).strip()
-                                batch_found = True
-                                logger.debug(f"Found batch number using pattern {pattern_idx}: {metadata['Batch']}")
-                                logger.debug(f"Pattern used: {pattern.pattern}")
-                                break
-                        except (re.error, IndexError) as e:
-                            logger.error(f"Error using pattern {pattern_idx}: {str(e)}")
-                            continue
-                    
-                    # Try multi-line patterns if we're not at the last line
-                    if not batch_found and i < len(lines) - 2:
-                        try:
-                            three_lines = '\n'.join(lines[i:i+3])
-                            logger.debug(f"Trying multi-line pattern with lines:\n{three_lines}")
-                            for pattern_idx, pattern in enumerate(batch_patterns):
-                                try:
-                                    if batch_match := pattern.search(three_lines):
-                                        metadata["Batch"] = batch_match.group(1).strip()
-                                        batch_found = True
-                                        logger.debug(f"Found batch number using multi-line pattern {pattern_idx}: {metadata['Batch']}")
-                                        logger.debug(f"Pattern used: {pattern.pattern}")
-                                        break
-                                except (re.error, IndexError) as e:
-                                    logger.error(f"Error using multi-line pattern {pattern_idx}: {str(e)}")
-                                    continue
-                        except Exception as e:
-                            logger.error(f"Error processing multi-line pattern: {str(e)}")
-                    
-                    if batch_found:
-                        continue
-                
                 # Look for production date and country
                 if "DATE OF PRODUCTION" in line:
-                    parts = re.split(r'\s{2,}', line)
+                    parts = _COLUMN_GAP_PATTERN.split(line)
                     if len(parts) > 1:
                         metadata["Production Date"] = parts[-1].strip()
-                        logger.debug(f"Found production date: {metadata['Production Date']}")
+                        logger.debug("Found production date: %s", metadata['Production Date'])
                     continue
                 
                 if "COUNTRY OF ORIGIN" in line:
-                    parts = re.split(r'\s{2,}', line)
+                    parts = _COLUMN_GAP_PATTERN.split(line)
                     if len(parts) > 1:
                         metadata["Country"] = parts[-1].strip()
-                        logger.debug(f"Found country: {metadata['Country']}")
+                        logger.debug("Found country: %s", metadata['Country'])
             except Exception as line_error:
                 logger.error(f"Error processing line {i}: {str(line_error)}")
                 continue
@@ -486,35 +517,35 @@ def extract_metadata(raw_text: str) -> Dict[str, str]:
                         line_upper = line.upper()
                         if any(x in line_upper for x in ["BATCH", "LOT"]):
                             batch_idx = i
-                            logger.debug(f"Found batch header at line {i}: '{line}'")
+                            logger.debug("Found batch header at line %d: '%s'", i, line)
                             # Check the next line for a batch number
                             if i + 1 < len(lines):
                                 next_line = lines[i + 1].strip()
-                                logger.debug(f"Checking next line for batch number: '{next_line}'")
-                                if re.match(r'^[0-9]{6}[A-Z][0-9]{3}$', next_line):
+                                logger.debug("Checking next line for batch number: '%s'", next_line)
+                                if _BATCH_STANDALONE.match(next_line):
                                     metadata["Batch"] = next_line
                                     batch_found = True
-                                    logger.debug(f"Found batch number in next line: {metadata['Batch']}")
+                                    logger.debug("Found batch number in next line: %s", metadata['Batch'])
                                     break
                         elif "QTY" in line_upper:
                             qty_idx = i
-                            logger.debug(f"Found qty header at line {i}: '{line}'")
+                            logger.debug("Found qty header at line %d: '%s'", i, line)
                             break
                     except Exception as line_error:
                         logger.error(f"Error in second pass line {i}: {str(line_error)}")
                         continue
                 
                 if not batch_found and batch_idx != -1 and qty_idx != -1:
-                    logger.debug(f"\nLooking between lines {batch_idx+1} and {qty_idx}")
+                    logger.debug("\nLooking between lines %d and %d", batch_idx+1, qty_idx)
                     # Look at lines between batch and qty
                     for line in lines[batch_idx+1:qty_idx]:
                         try:
                             line = line.strip()
-                            logger.debug(f"Checking line between batch and qty: '{line}'")
+                            logger.debug("Checking line between batch and qty: '%s'", line)
                             if re.match(r'^[0-9A-Z]+(?:[A-Z][0-9]+)?$', line):
                                 metadata["Batch"] = line
                                 batch_found = True
-                                logger.debug(f"Found standalone batch number: {metadata['Batch']}")
+                                logger.debug("Found standalone batch number: %s", metadata['Batch'])
                                 break
                         except Exception as e:
                             logger.error(f"Error checking batch-qty line: {str(e)}")
@@ -535,6 +566,14 @@ def extract_metadata(raw_text: str) -> Dict[str, str]:
         return {"Batch": "N/A"}
 
 
+# Colored result labels for terminal output
+_RESULT_COLORS = {
+    "PASS": "\033[92mPASS\033[0m",  # Green
+    "FAIL": "\033[91mFAIL\033[0m",  # Red
+    "UNKNOWN": "\033[93mUNKNOWN\033[0m",  # Yellow
+}
+
+
 def print_results(results: List[TestResult], metadata: Dict[str, str], show_ascii_viz: bool = False):
     """Print the analysis results to console."""
     # Print metadata
@@ -549,17 +588,11 @@ def print_results(results: List[TestResult], metadata: Dict[str, str], show_asci
     print(f"{'Test Name':<20} {'Value':<10} {'Specification':<20} {'Result':<10}")
     print("-" * 80)
     
+    # Add color indicators for terminal if supported
+    result_formats = _RESULT_COLORS if sys.stdout.isatty() else {}
+    
     for result in results:
-        result_display = result.result
-        # Add color indicators for terminal if supported
-        if sys.stdout.isatty():
-            if result.result == "PASS":
-                result_display = f"\033[92m{result.result}\033[0m"  # Green
-            elif result.result == "FAIL":
-                result_display = f"\033[91m{result.result}\033[0m"  # Red
-            elif result.result == "UNKNOWN":
-                result_display = f"\033[93m{result.result}\033[0m"  # Yellow
-                
+        result_display = result_formats.get(result.result, result.result)
         print(f"{result.name:<20} {result.value:<10} {result.specification:<20} {result_display:<10}")
     
     # Print ASCII visualization if requested
@@ -569,19 +602,16 @@ def print_results(results: List[TestResult], metadata: Dict[str, str], show_asci
         bar_width = 50
         
         for result in results:
-            # Create a visual bar
-            bar_str = ""
+            # Pick the bar fill for this result
             if result.result == "PASS":
-                bar_str = "█" * bar_width
-                indicator = "✓"
+                fill, indicator = "█", "✓"
             elif result.result == "FAIL":
-                bar_str = "▒" * bar_width
-                indicator = "✗"
+                fill, indicator = "▒", "✗"
             else:
-                bar_str = "░" * bar_width
-                indicator = "?"
+                fill, indicator = "░", "?"
             
             # Try to show where the value falls within specification
+            position = None
             min_val, max_val = parse_specification(result.specification)
             try:
                 value = float(result.value)
@@ -591,18 +621,20 @@ def print_results(results: List[TestResult], metadata: Dict[str, str], show_asci
                     if range_size > 0:
                         position = int(((value - min_val) / range_size) * bar_width)
                         position = max(0, min(bar_width - 1, position))
-                        bar_list = list(bar_str)
-                        bar_list[position] = '|'
-                        bar_str = ''.join(bar_list)
             except (ValueError, TypeError):
                 pass
             
+            # Build the bar in one go, with the marker at the value's position
+            if position is None:
+                bar_str = fill * bar_width
+            else:
+                bar_str = fill * position + '|' + fill * (bar_width - position - 1)
+            
             print(f"{result.name:<15} [{bar_str}] {indicator}")
     
     # Summary
-    passes = sum(1 for r in results if r.result == "PASS")
-    fails = sum(1 for r in results if r.result == "FAIL")
-    unknowns = sum(1 for r in results if r.result == "UNKNOWN")
+    counts = Counter(r.result for r in results)
+    passes, fails, unknowns = counts["PASS"], counts["FAIL"], counts["UNKNOWN"]
     
     print("\nSummary:")
     print(f"Total Tests: {len(results)}")
@@ -619,7 +651,7 @@ def print_results(results: List[TestResult], metadata: Dict[str, str], show_asci
 
 def save_to_csv(results: List[TestResult], metadata: Dict[str, str], output_file: str):
     """Save results to a CSV file."""
-    with open(output_file, 'w', newline='') as csvfile:
+    with open(output_file, 'w', newline='', buffering=65536) as csvfile:
         writer = csv.writer(csvfile)
         
         # Write metadata header
@@ -637,22 +669,16 @@ def save_to_csv(results: List[TestResult], metadata: Dict[str, str], output_file
         
         # Write results
         writer.writerow(['Test Name', 'Test Method', 'Unit', 'Value', 'Specification', 'Result'])
-        for result in results:
-            writer.writerow([
-                result.name, 
-                result.method, 
-                result.unit, 
-                result.value, 
-                result.specification, 
-                result.result
-            ])
+        writer.writerows([
+            (r.name, r.method, r.unit, r.value, r.specification, r.result)
+            for r in results
+        ])
         
         writer.writerow([])  # Blank row
         
         # Write summary
-        passes = sum(1 for r in results if r.result == "PASS")
-        fails = sum(1 for r in results if r.result == "FAIL")
-        unknowns = sum(1 for r in results if r.result == "UNKNOWN")
+        counts = Counter(r.result for r in results)
+        passes, fails, unknowns = counts["PASS"], counts["FAIL"], counts["UNKNOWN"]
         
         writer.writerow(['Summary'])
         writer.writerow(['Total Tests', len(results)])
@@ -663,28 +689,22 @@ def save_to_csv(results: List[TestResult], metadata: Dict[str, str], output_file
         if fails > 0:
             writer.writerow([])
             writer.writerow(['Failed Tests'])
-            for result in results:
-                if result.result == "FAIL":
-                    writer.writerow([result.name, result.value, result.specification])
+            writer.writerows([
+                (r.name, r.value, r.specification)
+                for r in results if r.result == "FAIL"
+            ])
+
+
+# Common COA indicators, matched in a single scan of the page text
+_COA_INDICATORS_RE = re.compile(
+    r'CERTIFICATE OF ANALYSIS|Test Name|Test Method|Unit|Value|Specification|Batch|Material:|Reference No:'
+)
 
 
 def is_coa_page(text: str) -> bool:
     """Determine if a page contains COA data."""
-    # Check for common COA indicators
-    indicators = [
-        "CERTIFICATE OF ANALYSIS",
-        "Test Name",
-        "Test Method",
-        "Unit",
-        "Value",
-        "Specification",
-        "Batch",
-        "Material:",
-        "Reference No:"
-    ]
-    
-    # Count how many indicators are present
-    matches = sum(1 for indicator in indicators if indicator in text)
+    # Count how many distinct indicators are present
+    matches = len(set(_COA_INDICATORS_RE.findall(text)))
     
     # If we find at least 3 indicators, it's likely a COA page
     return matches >= 3
@@ -692,9 +712,17 @@ def is_coa_page(text: str) -> bool:
 
 def read_pdf_file(file_path: str) -> str:
     """Extract text from a PDF file."""
-    logger.debug(f"Starting PDF processing for: {file_path}")
+    return _read_pdf(file_path)[0]
+
+
+def _read_pdf(file_path: str) -> Tuple[str, bool]:
+    """Extract text from a PDF file, also reporting whether it was read in full.
+    
+    The flag is False when a required tool is missing or reading failed, and
+    when OCR failed on any page, in which case the text may be incomplete.
+    """
+    logger.debug("Starting PDF processing for: %s", file_path)
     reader = None
-    coa_text = ""
     
     # Check if dependencies are available
     if not tesseract_path:
@@ -703,7 +731,7 @@ def read_pdf_file(file_path: str) -> str:
         print("\nError: Tesseract OCR is required but not found on this system.")
         print("Please install Tesseract OCR from: https://github.com/UB-Mannheim/tesseract/wiki")
         print("After installation, restart the application.\n")
-        return "ERROR: Tesseract OCR not found. Please install and restart."
+        return "ERROR: Tesseract OCR not found. Please install and restart.", False
         
     if not poppler_path:
         logger.error("Poppler not found. Please install from https://github.com/oschwartz10612/poppler-windows/releases/")
@@ -711,88 +739,165 @@ def read_pdf_file(file_path: str) -> str:
         print("\nError: Poppler PDF tools are required but not found on this system.")
         print("Please install Poppler from: https://github.com/oschwartz10612/poppler-windows/releases/")
         print("After installation, restart the application.\n")
-        return "ERROR: Poppler not found. Please install and restart."
+        return "ERROR: Poppler not found. Please install and restart.", False
     
     try:
-        # First try regular text extraction
+        # First try regular text extraction, remembering pages without a text layer
         reader = PyPDF2.PdfReader(file_path)
+        page_texts = []
+        missing_pages = []
+        for i, page in enumerate(reader.pages):
+            # Image-only (scanned) pages have no fonts; skip parsing their content streams
+            text = (page.extract_text() or "") if _page_has_fonts(page) else ""
+            page_texts.append(text)
+            if not text.strip():
+                missing_pages.append(i)
         
-        # Process each page
-        for page in reader.pages:
-            text = page.extract_text()
-            if is_coa_page(text):
-                coa_text += text + "\n\n"
+        # Explicitly close and release PDF resources
+        reader = None
         
-        if coa_text.strip():
+        # OCR only the pages that had no text, one pdf2image call per run of pages
+        ocr_complete = True
+        if missing_pages:
+            logger.debug("No text found on %d of %d pages, attempting OCR...", len(missing_pages), len(page_texts))
+            logger.debug("Using found poppler path: %s", poppler_path)
+            for first, last in _group_page_ranges(missing_pages):
+                try:
+                    # Convert the pages to grayscale images with found poppler path
+                    images = pdf2image.convert_from_path(
+                        file_path,
+                        dpi=OCR_DPI,
+                        grayscale=True,
+                        first_page=first + 1,
+                        last_page=last + 1,
+                        thread_count=1 if _batch_worker else max(2, (os.cpu_count() or 2) // 2),
+                        use_pdftocairo=True,
+                        poppler_path=poppler_path
+                    )
+                    
+                    # Process each image with OCR, handing the PIL image straight to pytesseract
+                    for i, image in enumerate(images, start=first):
+                        try:
+                            page_texts[i] = pytesseract.image_to_string(image)
+                        except Exception as e:
+                            logger.error(f"Error processing page {i}: {e}")
+                            ocr_complete = False
+                except Exception as e:
+                    logger.error(f"OCR processing failed for pages {first + 1}-{last + 1}: {e}")
+                    ocr_complete = False
+        
+        # Keep only the pages that look like COA pages, in document order
+        parts = [text for text in page_texts if is_coa_page(text)]
+        if parts:
             logger.debug("Successfully extracted text from PDF")
-            # Explicitly close and release PDF resources
-            reader = None
-            return coa_text
-        
-        # If no text was extracted, try OCR
-        logger.debug("No text found in PDF, attempting OCR...")
-        import tempfile
-        with tempfile.TemporaryDirectory() as path:
-            try:
-                logger.debug(f"Using found poppler path: {poppler_path}")
-                
-                # Convert PDF to images with found poppler path
-                images = pdf2image.convert_from_path(
-                    file_path,
-                    poppler_path=poppler_path
-                )
-                ocr_text = ""
-                
-                # Process each image with OCR
-                for i, image in enumerate(images):
-                    temp_file = os.path.join(path, f'page_{i}.png')
-                    try:
-                        # Save image to temp file
-                        image.save(temp_file, 'PNG')
-                        # Process with OCR
-                        page_text = pytesseract.image_to_string(temp_file)
-                        
-                        if is_coa_page(page_text):
-                            ocr_text += page_text + "\n\n"
-                            
-                        # Explicitly delete the image from memory after processing
-                        del page_text
-                        # Explicitly remove temp file after processing
-                        if os.path.exists(temp_file):
-                            try:
-                                os.remove(temp_file)
-                            except:
-                                pass
-                    except Exception as e:
-                        logger.error(f"Error processing page {i}: {e}")
-                    finally:
-                        # Make sure image is released
-                        image = None
-                
-                # Release all images
-                del images
-                
-                # Return OCR text if any was found
-                if ocr_text.strip():
-                    return ocr_text
-                else:
-                    logger.warning("OCR completed but no text was extracted")
-                    return ""
-            except Exception as e:
-                logger.error(f"OCR processing failed: {e}")
-                return ""
-            finally:
-                # Extra cleanup to ensure tempdir gets cleared
-                import gc
-                gc.collect()
+            return "\n\n".join(parts), ocr_complete
+        
+        logger.warning("No COA text could be extracted from the PDF")
+        return "", ocr_complete
     except Exception as e:
         logger.error(f"Error reading PDF file: {e}")
-        return ""
+        return "", False
     finally:
         # Final cleanup
         reader = None
-        import gc
-        gc.collect()
+
+
+def _page_has_fonts(page) -> bool:
+    """Check whether a PDF page can contain a text layer at all.
+    
+    Text needs a font resource, either on the page itself or inside a form
+    XObject it draws. Pages with neither are pure images, so text extraction
+    would only decode their content streams to find nothing.
+    """
+    try:
+        resources = page.get('/Resources')
+        if resources is None:
+            return False
+        resources = resources.get_object()
+        if '/Font' in resources:
+            return True
+        xobjects = resources.get('/XObject')
+        if xobjects is not None:
+            for xobject in xobjects.get_object().values():
+                if xobject.get_object().get('/Subtype') == '/Form':
+                    return True
+        return False
+    except Exception as e:
+        # If the resources can't be inspected, fall back to extracting the text
+        logger.debug("Could not inspect page resources: %s", e)
+        return True
+
+
+def _group_page_ranges(pages: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted page indexes into (first, last) runs of consecutive pages."""
+    ranges = []
+    for page in pages:
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+    return ranges
+
+
+def _init_batch_worker(log_queue, log_level: int, tesseract: Optional[str], poppler: Optional[str]):
+    """Set up a batch worker process.
+    
+    Tesseract and pdftocairo are limited to one thread so workers don't
+    oversubscribe cores. Log records go to the parent through log_queue
+    rather than to a second handle on the log file, which would break its
+    rollover on Windows. The tool paths are the ones the parent found.
+    """
+    global _batch_worker, tesseract_path, poppler_path
+    _batch_worker = True
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(log_level)
+    
+    tesseract_path, poppler_path = tesseract, poppler
+    if tesseract_path:
+        pytesseract.pytesseract.tesseract_cmd = os.path.join(tesseract_path, 'tesseract.exe')
+
+
+@contextmanager
+def _batch_pool(max_workers: Optional[int]):
+    """Start a pool of batch worker processes that log through this process's handlers."""
+    root = logging.getLogger()
+    log_queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(log_queue, root.level, tesseract_path, poppler_path)
+        ) as executor:
+            yield executor
+    finally:
+        listener.stop()
+
+
+def read_pdf_batch(paths: List[str], max_workers: Optional[int] = None) -> List[str]:
+    """Extract text from several PDF files in parallel.
+    
+    Each PDF is handled by read_pdf_file in its own worker process, so a
+    directory of COAs scales across cores. Within a single PDF the OCR work
+    already runs on threads/subprocesses; processes are used here because
+    the PyPDF2 parsing between files is CPU-bound Python code. Results are
+    returned in the same order as paths.
+    
+    main() does not use this: its batch mode also runs the extractors in
+    the workers and handles files as they finish. It is kept as public API
+    for callers that only need the text of several PDFs.
+    """
+    if not paths:
+        return []
+    with _batch_pool(max_workers) as executor:
+        return list(executor.map(read_pdf_file, paths))
 
 
 def read_input_file(file_path: str) -> str:
@@ -803,15 +908,90 @@ def read_input_file(file_path: str) -> str:
         print(f"Processing PDF file: {file_path}")
         return read_pdf_file(file_path)
     else:
-        # Assume it's a text file
+        # Assume it's a text file; map it and decode straight from the page cache
         try:
-            with open(file_path, 'r') as f:
-                return f.read()
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    text = str(mm, 'utf-8', 'replace')
+            # Normalize line endings like text-mode reads did
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
         except Exception as e:
             print(f"Error reading file: {e}")
             sys.exit(1)
 
 
+def _read_batch_pdf(filepath: str) -> Tuple[str, bool]:
+    """Read one PDF of a batch run, returning its text and whether it was read in full."""
+    print(f"Processing PDF file: {filepath}")
+    return _read_pdf(filepath)
+
+
+def _extract_text(filepath: str, coa_text: str, complete: bool) -> Tuple[str, Optional[List[TestResult]], Dict[str, str], bool]:
+    """Run the extractors on one file's text.
+    
+    The last element says whether the output may be cached: files that were
+    not read in full (missing tools, reader errors such as "ERROR:" text, or
+    failed OCR pages) and files with no results are retried on the next run
+    instead.
+    """
+    if not coa_text.strip():
+        return filepath, None, {}, False
+    results = extract_coa_data(coa_text)
+    cacheable = complete and bool(results)
+    return filepath, results, extract_metadata(coa_text), cacheable
+
+
+def _process_one(filepath: str) -> Tuple[str, Optional[List[TestResult]], Dict[str, str], bool]:
+    """Read and extract a single COA file; runs in a batch worker process."""
+    logger.info(f"\nProcessing {os.path.basename(filepath)}...")
+    return _extract_text(filepath, *_read_batch_pdf(filepath))
+
+
+def _read_ahead(pdf_paths: List[str], text_queue: "queue.Queue") -> None:
+    """Read PDFs on a background thread, handing (path, text, complete) to the queue."""
+    try:
+        for filepath in pdf_paths:
+            try:
+                coa_text, complete = _read_batch_pdf(filepath)
+            except Exception as e:
+                logger.error(f"Error reading {os.path.basename(filepath)}: {e}")
+                coa_text, complete = "", False
+            text_queue.put((filepath, coa_text, complete))
+    finally:
+        # Sentinel: no more files
+        text_queue.put(None)
+
+
+def _iter_batch_results(pdf_paths: List[str], jobs: Optional[int]):
+    """Yield (filepath, results, metadata, cacheable) for each PDF as it finishes.
+    
+    With a single job, a reader thread keeps a few PDFs read ahead while the
+    main thread runs the extractors, so PDF I/O overlaps with regex work.
+    Otherwise each file is handled end to end by a worker process.
+    """
+    if jobs == 1:
+        text_queue = queue.Queue(maxsize=4)
+        reader = threading.Thread(target=_read_ahead, args=(pdf_paths, text_queue), daemon=True)
+        reader.start()
+        while (item := text_queue.get()) is not None:
+            yield _extract_text(*item)
+        reader.join()
+        return
+    
+    # Process the files in parallel, one worker process per PDF
+    with _batch_pool(jobs) as executor:
+        futures = {executor.submit(_process_one, filepath): filepath for filepath in pdf_paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                logger.error(f"Error processing {os.path.basename(futures[future])}: {e}")
+
+
 def print_summary_table(results_list: List[Tuple[str, List[TestResult], Dict[str, str]]]):
     """Print a summary table of all processed PDFs and their results."""
     print("\nSummary of All Processed COAs:")
@@ -828,8 +1008,8 @@ def print_summary_table(results_list: List[Tuple[str, List[TestResult], Dict[str
         base_filename = os.path.basename(filename)
         
         # Count results
-        passes = sum(1 for r in results if r.result == "PASS")
-        fails = sum(1 for r in results if r.result == "FAIL")
+        counts = Counter(r.result for r in results)
+        passes, fails = counts["PASS"], counts["FAIL"]
         
         # Get metadata
         material = metadata.get("Material", "").split()[0] if metadata.get("Material") else "N/A"
@@ -857,11 +1037,16 @@ def main():
     parser.add_argument('-v', '--visualize', help='Show ASCII visualization of results', action='store_true')
     parser.add_argument('-d', '--debug', help='Enable debug logging', action='store_true')
     parser.add_argument('-b', '--batch', help='Process all PDFs in a directory', action='store_true')
+    parser.add_argument('-j', '--jobs', help='Number of worker processes for batch mode (default: CPU count, 1 reads ahead on a thread instead)', type=int, default=None)
+    parser.add_argument('--no-cache', help='Re-extract every PDF in batch mode instead of reusing cached results', action='store_true')
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"argument -j/--jobs: must be at least 1, got {args.jobs}")
     
     # Set logging level based on debug flag
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
+        stream_handler.setLevel(logging.DEBUG)
     
     all_results = []
     
@@ -872,20 +1057,33 @@ def main():
             logger.error(f"Input directory not found: {input_dir}")
             sys.exit(1)
             
-        for filename in os.listdir(input_dir):
-            if filename.lower().endswith('.pdf'):
-                filepath = os.path.join(input_dir, filename)
-                logger.info(f"\nProcessing {filename}...")
-                
-                # Process the file
-                coa_text = read_input_file(filepath)
-                if not coa_text.strip():
-                    logger.error(f"No COA data found in {filename}")
+        pdf_paths = [
+            os.path.join(input_dir, filename)
+            for filename in os.listdir(input_dir)
+            if filename.lower().endswith('.pdf')
+        ]
+        
+        # Results depend on the OCR resolution as well as on the file
+        with ResultCache(TestResult, settings=f"dpi={OCR_DPI}") as cache:
+            # Unchanged PDFs are served from the cache; only the rest are extracted
+            cached_results = []
+            pending = []
+            for filepath in pdf_paths:
+                cached = None if args.no_cache else cache.get(filepath)
+                if cached is None:
+                    pending.append(filepath)
+                else:
+                    logger.info(f"Using cached results for {os.path.basename(filepath)}")
+                    # Already cached, so never written back
+                    cached_results.append((filepath, *cached, False))
+            
+            fresh_results = _iter_batch_results(pending, args.jobs)
+            for filepath, results, metadata, cacheable in chain(cached_results, fresh_results):
+                if results is None:
+                    logger.error(f"No COA data found in {os.path.basename(filepath)}")
                     continue
-                
-                # Extract data
-                results = extract_coa_data(coa_text)
-                metadata = extract_metadata(coa_text)
+                if cacheable:
+                    cache.put(filepath, results, metadata)
                 
                 # Save results if output specified
                 if args.output:
@@ -895,6 +1093,10 @@ def main():
                 
                 all_results.append((filepath, results, metadata))
         
+        # Keep the summary in directory listing order
+        order = {filepath: i for i, filepath in enumerate(pdf_paths)}
+        all_results.sort(key=lambda item: order[item[0]])
+        
         # Print summary table
         if all_results:
             print_summary_table(all_results)
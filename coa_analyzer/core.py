@@ -1,11 +1,42 @@
 """Core functionality for the COA Analyzer."""
 
 import re
+import sys
 from dataclasses import dataclass
 from typing import List, Optional, Tuple, Dict
 
+# Specification formats, tried in order: "= < X", "= > X", "X - Y", "- Y"
+_SPEC_ALL = re.compile(
+    r'=\s*<\s*(?P<lt>\d+\.?\d*)'
+    r'|=\s*>\s*(?P<gt>\d+\.?\d*)'
+    r'|(?P<lo>\d+\.?\d*)\s*-\s*(?P<hi>\d+\.?\d*)'
+    r'|-\s*(?P<maxonly>\d+\.?\d*)'
+)
 
-@dataclass
+# Column separator (two or more spaces)
+_WS2 = re.compile(r'\s{2,}')
+
+# Metadata fields whose value follows a colon, checked in priority order
+_COLON_FIELDS = {"Material:": "Material", "Reference No:": "Reference"}
+
+# Metadata fields whose value is the last column of the line
+_COLUMN_FIELDS = {"DATE OF PRODUCTION": "Production Date", "COUNTRY OF ORIGIN": "Country"}
+
+# Classifies a table line in one scan: metadata lines to skip, the ML100
+# special case, or a full test row with an N200 method
+_LINE_RE = re.compile(
+    r'(?P<skip>(?i:.*?(?:MATERIAL:|BATCH|QTY|REFERENCE)))'
+    r'|(?P<ml100>.*?ML100)'
+    r'|(?P<row>(?P<name>[^\s]+(?:\s+[^\s]+)*)\s+(?P<method>N200\.\d+)\s+'
+    r'(?P<unit>[^\s]*)\s+(?P<value>[^\s]+)\s+(?P<spec>.*))'
+)
+
+
+# dataclass(slots=...) needs Python 3.10; older interpreters get a regular class
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class TestResult:
     """Class to store individual test results from a COA."""
     name: str
@@ -21,40 +52,44 @@ def parse_specification(spec_str: str) -> Tuple[Optional[float], Optional[float]
     if not spec_str or spec_str == "N/A":
         return None, None
     
+    match = _SPEC_ALL.match(spec_str)
+    if not match:
+        return None, None
+    
     # Handle "= < X.XX" format
-    if match := re.match(r'=\s*<\s*(\d+\.?\d*)', spec_str):
-        return None, float(match.group(1))
+    if (lt := match.group('lt')) is not None:
+        return None, float(lt)
     
     # Handle "= > X.XX" format
-    if match := re.match(r'=\s*>\s*(\d+\.?\d*)', spec_str):
-        return float(match.group(1)), None
+    if (gt := match.group('gt')) is not None:
+        return float(gt), None
     
     # Handle "X.XX - Y.YY" format
-    if match := re.match(r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)', spec_str):
-        return float(match.group(1)), float(match.group(2))
+    if (lo := match.group('lo')) is not None:
+        return float(lo), float(match.group('hi'))
     
     # Handle "- Y.YY" format (missing min value)
-    if match := re.match(r'-\s*(\d+\.?\d*)', spec_str):
-        return None, float(match.group(1))
-    
-    return None, None
+    return None, float(match.group('maxonly'))
 
 
 def evaluate_result(value_str: str, spec_str: str) -> str:
     """Evaluate if a value passes the specification."""
+    if not spec_str or spec_str == "N/A":
+        return "UNKNOWN"  # Can't evaluate without specification
+    
+    min_val, max_val = parse_specification(spec_str)
+    if min_val is None and max_val is None:
+        return "UNKNOWN"  # Unparseable specification
+    
     try:
         value = float(value_str)
     except ValueError:
         return "UNKNOWN"  # Non-numeric values can't be evaluated
     
-    min_val, max_val = parse_specification(spec_str)
-    
     if min_val is not None and value < min_val:
         return "FAIL"
     if max_val is not None and value > max_val:
         return "FAIL"
-    if (min_val is None and max_val is None):
-        return "UNKNOWN"  # Can't evaluate without specification
     
     return "PASS"
 
@@ -82,14 +117,17 @@ def extract_coa_data(raw_text: str) -> List[TestResult]:
         if not line:
             continue
             
+        match = _LINE_RE.match(line)
+        kind = match.lastgroup if match else None
+        
         # Skip lines that clearly aren't test results
-        if any(x in line.upper() for x in ["MATERIAL:", "BATCH", "QTY", "REFERENCE"]):
+        if kind == "skip":
             continue
             
         # Special case for ML100 which has a different format
-        if "ML100" in line:
+        if kind == "ml100":
             # ML100 has a specific format issue in the sample
-            parts = re.split(r'\s{2,}', line)
+            parts = _WS2.split(line)
             if len(parts) >= 3:
                 test_name = parts[0].strip()
                 test_method = parts[1].strip() if len(parts) > 1 else ""
@@ -113,27 +151,18 @@ def extract_coa_data(raw_text: str) -> List[TestResult]:
                 ))
             continue
             
-        # Split the line based on whitespace, but preserve column alignment
-        parts = []
-        word_parts = line.split()
-        
-        if len(word_parts) >= 3:  # At least test name, some value, and possibly specification
-            # For lines with complete data
-            if "N200" in line:  # Test method lines typically have the N200 code
-                # Try to extract parts based on the expected format
-                match = re.match(r'([^\s]+(?:\s+[^\s]+)*)\s+(N200\.\d+)\s+([^\s]*)\s+([^\s]+)\s+(.*)', line)
-                if match:
-                    test_name, test_method, unit, value, specification = match.groups()
-                    parts = [test_name, test_method, unit, value, specification]
-                else:
-                    # Fallback to a simpler pattern if the above doesn't match
-                    parts = re.split(r'\s{2,}', line)
-            else:
-                # For lines without test method (like DATE OF PRODUCTION)
-                parts = re.split(r'\s{2,}', line)
-                # Add placeholder for missing fields
-                if len(parts) == 2:  # Just name and value
-                    parts = [parts[0], "", "", parts[1], ""]
+        # Use the full row match when the line has an N200 test method
+        if match is not None and kind == "row":
+            parts = list(match.group("name", "method", "unit", "value", "spec"))
+        elif len(line.split()) >= 3:  # At least test name, some value, and possibly specification
+            # Fallback to splitting on column gaps, e.g. for lines without
+            # a test method (like DATE OF PRODUCTION)
+            parts = _WS2.split(line)
+            # Add placeholder for missing fields
+            if "N200" not in line and len(parts) == 2:  # Just name and value
+                parts = [parts[0], "", "", parts[1], ""]
+        else:
+            parts = []
         
         if len(parts) >= 4:  # Need at least name, method, unit, value
             test_name = parts[0].strip()
@@ -163,36 +192,30 @@ def extract_coa_data(raw_text: str) -> List[TestResult]:
 def extract_metadata(raw_text: str) -> Dict[str, str]:
     """Extract metadata from the COA text."""
     metadata = {}
+    column_fields = {}
     lines = raw_text.strip().split('\n')
     
-    # Extract material information
-    for line in lines:
-        if "Material:" in line:
-            parts = line.split(":", 1)
-            if len(parts) > 1:
-                metadata["Material"] = parts[1].strip()
-        
-        elif "Reference No:" in line:
-            parts = line.split(":", 1)
-            if len(parts) > 1:
-                metadata["Reference"] = parts[1].strip()
-        
-        elif "Batch" in line:
-            # Look for batch information in next line
-            batch_idx = lines.index(line)
-            if batch_idx + 1 < len(lines) and lines[batch_idx + 1].strip():
-                metadata["Batch"] = lines[batch_idx + 1].strip()
-    
-    # Look for production date and country
     for i, line in enumerate(lines):
-        if "DATE OF PRODUCTION" in line:
-            parts = re.split(r'\s{2,}', line)
-            if len(parts) > 1:
-                metadata["Production Date"] = parts[-1].strip()
+        # Extract material information
+        for token, key in _COLON_FIELDS.items():
+            if token in line:
+                # The token contains the colon, so partition always splits
+                metadata[key] = line.partition(":")[2].strip()
+                break
+        else:
+            if "Batch" in line:
+                # Look for batch information in next line
+                if i + 1 < len(lines) and lines[i + 1].strip():
+                    metadata["Batch"] = lines[i + 1].strip()
         
-        elif "COUNTRY OF ORIGIN" in line:
-            parts = re.split(r'\s{2,}', line)
-            if len(parts) > 1:
-                metadata["Country"] = parts[-1].strip()
-    
-    return metadata 
\ No newline at end of file
+        # Look for production date and country
+        for token, key in _COLUMN_FIELDS.items():
+            if token in line:
+                parts = _WS2.split(line)
+                if len(parts) > 1:
+                    column_fields[key] = parts[-1].strip()
+                break
+    
+    # Date and country keep their place after the header fields
+    metadata.update(column_fields)
+    return metadata
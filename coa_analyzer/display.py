@@ -1,11 +1,20 @@
 """Display functions for COA Analyzer."""
 
 import sys
+from collections import Counter
 from typing import Dict, List
 
 from .core import TestResult, parse_specification
 
 
+# Colored result labels for terminal output
+_RESULT_COLORS = {
+    "PASS": "\033[92mPASS\033[0m",  # Green
+    "FAIL": "\033[91mFAIL\033[0m",  # Red
+    "UNKNOWN": "\033[93mUNKNOWN\033[0m",  # Yellow
+}
+
+
 def print_results(results: List[TestResult], metadata: Dict[str, str], show_ascii_viz: bool = False):
     """Print the analysis results to console."""
     # Print metadata
@@ -20,17 +29,11 @@ def print_results(results: List[TestResult], metadata: Dict[str, str], show_asci
     print(f"{'Test Name':<20} {'Value':<10} {'Specification':<20} {'Result':<10}")
     print("-" * 80)
     
+    # Add color indicators for terminal if supported
+    result_formats = _RESULT_COLORS if sys.stdout.isatty() else {}
+    
     for result in results:
-        result_display = result.result
-        # Add color indicators for terminal if supported
-        if sys.stdout.isatty():
-            if result.result == "PASS":
-                result_display = f"\033[92m{result.result}\033[0m"  # Green
-            elif result.result == "FAIL":
-                result_display = f"\033[91m{result.result}\033[0m"  # Red
-            elif result.result == "UNKNOWN":
-                result_display = f"\033[93m{result.result}\033[0m"  # Yellow
-                
+        result_display = result_formats.get(result.result, result.result)
         print(f"{result.name:<20} {result.value:<10} {result.specification:<20} {result_display:<10}")
     
     # Print ASCII visualization if requested
@@ -40,19 +43,16 @@ def print_results(results: List[TestResult], metadata: Dict[str, str], show_asci
         bar_width = 50
         
         for result in results:
-            # Create a visual bar
-            bar_str = ""
+            # Pick the bar fill for this result
             if result.result == "PASS":
-                bar_str = "█" * bar_width
-                indicator = "✓"
+                fill, indicator = "█", "✓"
             elif result.result == "FAIL":
-                bar_str = "▒" * bar_width
-                indicator = "✗"
+                fill, indicator = "▒", "✗"
             else:
-                bar_str = "░" * bar_width
-                indicator = "?"
+                fill, indicator = "░", "?"
             
             # Try to show where the value falls within specification
+            position = None
             min_val, max_val = parse_specification(result.specification)
             try:
                 value = float(result.value)
@@ -62,18 +62,20 @@ def print_results(results: List[TestResult], metadata: Dict[str, str], show_asci
                     if range_size > 0:
                         position = int(((value - min_val) / range_size) * bar_width)
                         position = max(0, min(bar_width - 1, position))
-                        bar_list = list(bar_str)
-                        bar_list[position] = '|'
-                        bar_str = ''.join(bar_list)
             except (ValueError, TypeError):
                 pass
             
+            # Build the bar in one go, with the marker at the value's position
+            if position is None:
+                bar_str = fill * bar_width
+            else:
+                bar_str = fill * position + '|' + fill * (bar_width - position - 1)
+            
             print(f"{result.name:<15} [{bar_str}] {indicator}")
     
     # Summary
-    passes = sum(1 for r in results if r.result == "PASS")
-    fails = sum(1 for r in results if r.result == "FAIL")
-    unknowns = sum(1 for r in results if r.result == "UNKNOWN")
+    counts = Counter(r.result for r in results)
+    passes, fails, unknowns = counts["PASS"], counts["FAIL"], counts["UNKNOWN"]
     
     print("\nSummary:")
     print(f"Total Tests: {len(results)}")
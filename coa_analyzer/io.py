@@ -4,11 +4,8 @@ import csv
 import os
 import sys
 import logging
-try:
-    import PyPDF2
-except ImportError:
-    print("Error: PyPDF2 package not found. Please install it using 'pip install PyPDF2'")
-    sys.exit(1)
+import mmap
+from collections import Counter
 from typing import Dict, List
 
 from .core import TestResult
@@ -18,12 +15,30 @@ logger = logging.getLogger(__name__)
 
 def read_pdf_file(file_path: str) -> str:
     """Read text from a PDF file."""
+    # PDF libraries are imported on first use so text input and --help start fast.
+    # Prefer pypdfium2 (native PDFium) for text extraction, falling back to PyPDF2
     try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+        try:
+            import PyPDF2
+        except ImportError:
+            print("Error: PyPDF2 package not found. Please install it using 'pip install PyPDF2'")
+            sys.exit(1)
+    
+    try:
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                text = "".join(page.get_textpage().get_text_range() for page in pdf)
+            finally:
+                pdf.close()
+            # PDFium reports line breaks as CRLF
+            return text.replace("\r\n", "\n")
+        
         reader = PyPDF2.PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        return "".join(page.extract_text() for page in reader.pages)
     except Exception as e:
         logger.error(f"Error reading PDF file: {e}")
         return ""
@@ -37,10 +52,17 @@ def read_input_file(file_path: str) -> str:
         print(f"Processing PDF file: {file_path}")
         return read_pdf_file(file_path)
     else:
-        # Assume it's a text file
+        # Assume it's a text file; map it and decode straight from the page cache
         try:
-            with open(file_path, 'r') as f:
-                return f.read()
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    text = str(mm, 'utf-8', 'replace')
+            # Normalize line endings like text-mode reads did
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
         except Exception as e:
             print(f"Error reading file: {e}")
             sys.exit(1)
@@ -57,25 +79,31 @@ def save_to_csv(results: List[TestResult], metadata: Dict[str, str], output_file
         
         writer.writerow([])  # Blank row
         
-        # Write results
+        # Write results, counting outcomes and collecting failures in the same pass
         writer.writerow(['Test Name', 'Test Method', 'Unit', 'Value', 'Specification', 'Result'])
-        for result in results:
-            writer.writerow([
-                result.name, 
-                result.method, 
-                result.unit, 
-                result.value, 
-                result.specification, 
-                result.result
-            ])
+        counts = Counter()
+        failed = []
+        
+        def result_rows():
+            for result in results:
+                counts[result.result] += 1
+                if result.result == "FAIL":
+                    failed.append((result.name, result.value, result.specification))
+                yield (
+                    result.name,
+                    result.method,
+                    result.unit,
+                    result.value,
+                    result.specification,
+                    result.result
+                )
+        
+        writer.writerows(result_rows())
+        passes, fails, unknowns = counts["PASS"], counts["FAIL"], counts["UNKNOWN"]
         
         writer.writerow([])  # Blank row
         
         # Write summary
-        passes = sum(1 for r in results if r.result == "PASS")
-        fails = sum(1 for r in results if r.result == "FAIL")
-        unknowns = sum(1 for r in results if r.result == "UNKNOWN")
-        
         writer.writerow(['Summary'])
         writer.writerow(['Total Tests', len(results)])
         writer.writerow(['PASS', passes])
@@ -85,6 +113,4 @@ def save_to_csv(results: List[TestResult], metadata: Dict[str, str], output_file
         if fails > 0:
             writer.writerow([])
             writer.writerow(['Failed Tests'])
-            for result in results:
-                if result.result == "FAIL":
-                    writer.writerow([result.name, result.value, result.specification]) 
\ No newline at end of file
+            writer.writerows(failed)
@@ -18,6 +18,7 @@ def install_dependencies():
     # Core dependencies needed for the application
     required_packages = [
         "PyPDF2>=3.0.1",
+        "pypdfium2>=4.0",
         "pdf2image>=1.16.3",
         "pytesseract>=0.3.10",
         "Pillow>=10.2.0",
@@ -12,12 +12,20 @@ import time
 TESSERACT_URL = "https://digi.bib.uni-mannheim.de/tesseract/tesseract-ocr-w64-setup-v5.3.1.20230401.exe"
 TESSERACT_INSTALLER = "tesseract-ocr-w64-setup-v5.3.1.20230401.exe"
 
+# Read size per network read; larger reads mean fewer syscalls and redraws
+CHUNK_SIZE = 256 * 1024
+
 def download_with_progress(url, filename):
     """Download a file with a progress bar"""
     print(f"Downloading {filename}...")
     
-    def show_progress(count, block_size, total_size):
-        percent = min(100, count * block_size * 100 / total_size)
+    def show_progress(downloaded, total_size):
+        if not total_size:
+            # Server did not send a size; just report what has arrived
+            sys.stdout.write(f"\r{downloaded / 1048576:.1f} MB ")
+            sys.stdout.flush()
+            return
+        percent = min(100, downloaded * 100 / total_size)
         bar_length = 50
         filled_length = int(bar_length * percent / 100)
         bar = '█' * filled_length + '-' * (bar_length - filled_length)
@@ -27,11 +35,24 @@ def download_with_progress(url, filename):
         sys.stdout.flush()
     
     try:
-        urllib.request.urlretrieve(url, filename, show_progress)
+        with urllib.request.urlopen(url) as response, open(filename, 'wb') as f:
+            total_size = int(response.headers.get('Content-Length') or 0)
+            downloaded = 0
+            while chunk := response.read(CHUNK_SIZE):
+                f.write(chunk)
+                downloaded += len(chunk)
+                show_progress(downloaded, total_size)
+        
+        # A short read means a truncated installer; don't leave it behind
+        if total_size and downloaded != total_size:
+            raise IOError(f"expected {total_size} bytes but received {downloaded}")
+        
         print("\nDownload complete!")
         return True
     except Exception as e:
         print(f"\nError downloading {filename}: {e}")
+        if os.path.exists(filename):
+            os.remove(filename)
         return False
 
 def main():
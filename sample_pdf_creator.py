@@ -1,112 +1,216 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
+import argparse
+import io
+import os
+import shutil
+from functools import lru_cache
+from types import SimpleNamespace
 
+# Rendered sample, reused until this script changes
+_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'coa_analyzer', 'sample_coa.pdf')
 
-def create_sample_coa(output_file="sample_coa.pdf"):
-    """Create a sample Certificate of Analysis PDF file for testing."""
-    doc = SimpleDocTemplate(output_file, pagesize=letter)
+# Output is written through a 1 MiB buffer, i.e. one write() for a whole sample
+_WRITE_BUFFER = 1 << 20
+
+
+class _CenteredLine:
+    """One line of plain text centred in the frame.
+
+    Draws straight onto the canvas, skipping the markup parsing and line
+    breaking a Paragraph would do for a fixed heading. Importing Flowable
+    loads most of ReportLab, so _layout() makes the Flowable subclass.
+    """
+
+    def __init__(self, text, style):
+        super().__init__()
+        self.text = text
+        self.style = style
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = self.style.leading
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.setFillColor(self.style.textColor)
+        self.canv.setFont(self.style.fontName, self.style.fontSize)
+        self.canv.drawCentredString(self.width / 2, self.height - self.style.fontSize, self.text)
+
+
+@lru_cache(None)
+def _layout() -> SimpleNamespace:
+    """Import ReportLab and build the styles and page layout shared by every document.
+
+    Only rendering needs these, so runs served from the cached PDF never
+    load ReportLab; the first render builds them once.
+    """
+    # Attribute checks on ReportLab shapes only help while developing; switch them
+    # off before anything else imports the flag, unless COA_DEBUG_SHAPES is set
+    from reportlab import rl_config
+    if not os.environ.get('COA_DEBUG_SHAPES'):
+        rl_config.shapeChecking = 0
+
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.platypus import Flowable, Frame, PageTemplate, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_LEFT, TA_CENTER
+
+    # The sample stylesheet is costly to create
     styles = getSampleStyleSheet()
-    
-    # Create custom styles
-    title_style = ParagraphStyle(
-        name='TitleStyle',
-        parent=styles['Normal'],
-        fontSize=14,
-        alignment=TA_CENTER,
-        spaceAfter=12
-    )
-    
-    header_style = ParagraphStyle(
-        name='HeaderStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_LEFT,
-        spaceAfter=6
+
+    # One-inch margins, as SimpleDocTemplate used
+    margin = inch
+    frame = Frame(margin, margin, letter[0] - 2 * margin, letter[1] - 2 * margin, id='normal')
+
+    # TableStyle copies the command tuples into its own list and Table.setStyle
+    # only reads it, so one instance per table is safe to reuse
+    return SimpleNamespace(
+        centered_line=type('CenteredLine', (_CenteredLine, Flowable), {}),
+        title_style=ParagraphStyle(
+            name='TitleStyle',
+            parent=styles['Normal'],
+            fontSize=14,
+            alignment=TA_CENTER,
+            spaceAfter=12
+        ),
+        header_style=ParagraphStyle(
+            name='HeaderStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=TA_LEFT,
+            spaceAfter=6
+        ),
+        page_template=PageTemplate(id='Page', frames=[frame], pagesize=letter),
+        meta_style=TableStyle((
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        )),
+        batch_style=TableStyle((
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        )),
+        test_style=TableStyle((
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+            # The grid as row/column rules, so each rule is stroked once across the table
+            ('LINEABOVE', (0, 0), (-1, -1), 0.5, colors.black),
+            ('LINEBELOW', (0, -1), (-1, -1), 0.5, colors.black),
+            ('LINEBEFORE', (0, 0), (-1, -1), 0.5, colors.black),
+            ('LINEAFTER', (-1, 0), (-1, -1), 0.5, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        )),
     )
-    
-    normal_style = styles["Normal"]
+
+
+def _build_sample_coa() -> bytes:
+    """Render the sample Certificate of Analysis and return the PDF bytes."""
+    # Build the layout first: it switches off shape checking before the imports below
+    layout = _layout()
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import BaseDocTemplate, Preformatted, Table, Spacer
+
+    buffer = io.BytesIO()
+    doc = BaseDocTemplate(buffer, pagesize=letter, pageTemplates=[layout.page_template])
     
     # Content elements
     elements = []
     
     # Title
-    elements.append(Paragraph("Certificate of Analysis", title_style))
+    elements.append(layout.centered_line("Certificate of Analysis", layout.title_style))
     elements.append(Spacer(1, 12))
     
     # Metadata
-    metadata = [
-        ["Material:", "D14924998 NEOPRENE GNA M2 CHP 100 ABAG25KG"],
-        ["Our/Customer Reference No:", "S030068A"]
-    ]
+    metadata = (
+        ("Material:", "D14924998 NEOPRENE GNA M2 CHP 100 ABAG25KG"),
+        ("Our/Customer Reference No:", "S030068A")
+    )
     
     metadata_table = Table(metadata, colWidths=[150, 350])
-    metadata_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
+    metadata_table.setStyle(layout.meta_style)
     
     elements.append(metadata_table)
     elements.append(Spacer(1, 12))
     
     # Batch Information
-    batch_info = [
-        ["Batch", ""],
-        ["241226D257", ""],
-        ["Qty / Uom", ""],
-        ["2,205.000 /LB", ""]
-    ]
+    batch_info = (
+        ("Batch", ""),
+        ("241226D257", ""),
+        ("Qty / Uom", ""),
+        ("2,205.000 /LB", "")
+    )
     
     batch_table = Table(batch_info, colWidths=[150, 350])
-    batch_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-    ]))
+    batch_table.setStyle(layout.batch_style)
     
     elements.append(batch_table)
     elements.append(Spacer(1, 20))
     
     # Test Results table
-    elements.append(Paragraph("Test Results", header_style))
+    elements.append(Preformatted("Test Results", layout.header_style))
     elements.append(Spacer(1, 6))
     
-    test_data = [
-        ["Test Name", "Test Method", "Unit", "Value", "Specification"],
-        ["s'TPOINT90", "N200.7405", "dNm", "11.73", "7.50 - 12.50"],
-        ["TIME SCORCH01", "N200.7405", "min.", "2.47", "1.60 - 3.60"],
-        ["VOLATILE", "N200.9500", "%", "1.50", "= < 1.30"],
-        ["TIME TPOINT90", "N200.7405", "min.", "4.84", "2.10 - 7.60"],
-        ["ML100", "N200.5700", "", "53", "47 - 59"],
-        ["ML120", "N200.7460", "min.", "9.04", "= > 11.00"],
-        ["DATE OF PRODUCTION", "", "", "20241229", ""],
-        ["COUNTRY OF ORIGIN", "", "", "US", ""]
-    ]
+    test_data = (
+        ("Test Name", "Test Method", "Unit", "Value", "Specification"),
+        ("s'TPOINT90", "N200.7405", "dNm", "11.73", "7.50 - 12.50"),
+        ("TIME SCORCH01", "N200.7405", "min.", "2.47", "1.60 - 3.60"),
+        ("VOLATILE", "N200.9500", "%", "1.50", "= < 1.30"),
+        ("TIME TPOINT90", "N200.7405", "min.", "4.84", "2.10 - 7.60"),
+        ("ML100", "N200.5700", "", "53", "47 - 59"),
+        ("ML120", "N200.7460", "min.", "9.04", "= > 11.00"),
+        ("DATE OF PRODUCTION", "", "", "20241229", ""),
+        ("COUNTRY OF ORIGIN", "", "", "US", "")
+    )
     
-    test_table = Table(test_data, colWidths=[120, 80, 60, 80, 120])
-    test_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
+    test_table = Table(test_data, colWidths=[120, 80, 60, 80, 120], repeatRows=1)
+    test_table.setStyle(layout.test_style)
     
     elements.append(test_table)
     
     # Build the document
     doc.build(elements)
+    return buffer.getvalue()
+
+
+def create_sample_coa(output_file="sample_coa.pdf", regenerate=False):
+    """Create a sample Certificate of Analysis PDF file for testing.
+    
+    The content never changes, so the rendered PDF is cached and copied out on
+    later calls. It is rebuilt when this script is newer than the cache or
+    when regenerate is set.
+    """
+    cache_is_fresh = (
+        os.path.exists(_CACHE_FILE)
+        and os.path.getmtime(_CACHE_FILE) >= os.path.getmtime(__file__)
+    )
+    if not regenerate and cache_is_fresh:
+        with open(_CACHE_FILE, 'rb') as src, open(output_file, 'wb', buffering=_WRITE_BUFFER) as dst:
+            shutil.copyfileobj(src, dst, _WRITE_BUFFER)
+    else:
+        pdf_bytes = _build_sample_coa()
+        with open(output_file, 'wb', buffering=_WRITE_BUFFER) as f:
+            f.write(pdf_bytes)
+        try:
+            os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+            with open(_CACHE_FILE, 'wb') as f:
+                f.write(pdf_bytes)
+        except OSError as e:
+            print(f"Warning: could not cache sample COA: {e}")
     print(f"Sample COA PDF created: {output_file}")
 
 
 if __name__ == "__main__":
-    create_sample_coa() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Create a sample COA PDF for testing')
+    parser.add_argument('output', nargs='?', default='sample_coa.pdf', help='Output PDF file')
+    parser.add_argument('--regenerate', action='store_true', help='Rebuild the PDF instead of using the cached copy')
+    args = parser.parse_args()
+    create_sample_coa(args.output, regenerate=args.regenerate) 
\ No newline at end of file
@@ -7,70 +7,160 @@ import os
 import sys
 import subprocess
 import shutil
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version, PackageNotFoundError
 
-# Just install PyInstaller if needed
+# Just install PyInstaller if needed (checked via its metadata, without importing it)
 try:
-    import PyInstaller
-except ImportError:
+    version("pyinstaller")
+except PackageNotFoundError:
     print("Installing PyInstaller...")
     subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
 
+def find_pycaches(root, skip=()):
+    """Yield __pycache__ directories under root, not descending into skip.
+
+    os.scandir reports entry types from the directory listing, so unlike
+    os.walk this does not stat every file in the tree.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and entry.path not in skip:
+                if entry.name == '__pycache__':
+                    yield entry.path
+                else:
+                    yield from find_pycaches(entry.path, skip)
+
+def remove_dirs(paths):
+    """Delete directory trees, ignoring ones that are already gone"""
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+def source_hash(root, extra_files=()):
+    """SHA-256 over every source file under root (plus extra_files), in sorted order"""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != '__pycache__']
+        paths.extend(os.path.join(dirpath, name) for name in filenames)
+    digest = hashlib.sha256()
+    for path in sorted(paths) + list(extra_files):
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def run_logged(command, log_path, env=None):
+    """Run command, echoing its output to the console and to log_path"""
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               bufsize=1 << 16, text=True, env=env)
+    with open(log_path, 'w', buffering=1 << 20) as log:
+        for line in process.stdout:
+            sys.stdout.write(line)
+            log.write(line)
+    returncode = process.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, command)
+
 # Get the script directory
-current_dir = os.path.dirname(os.path.abspath(__file__))
+ROOT = Path(__file__).resolve().parent
+DIST = ROOT / 'dist'
+BUILD = ROOT / 'build'
+SCRIPT = ROOT / 'coa_analyzer' / 'coa_analyzer.py'
 
 print("=" * 60)
 print("COA Analyzer Simple Build Script")
 print("=" * 60)
-print(f"Working from directory: {current_dir}")
+print(f"Working from directory: {ROOT}")
+
+# Skip the whole build when the sources (and this script) are unchanged
+exe_path = DIST / 'COA_Analyzer.exe'
+hash_file = DIST / '.build_hash'
+build_hash = source_hash(str(ROOT / 'coa_analyzer'), [str(Path(__file__).resolve())])
+if exe_path.exists() and hash_file.exists():
+    if hash_file.read_text().strip() == build_hash:
+        print("\nBuild is up to date, nothing to do.")
+        print(f"Executable is in: {exe_path}")
+        input("\nPress Enter to exit...")
+        sys.exit(0)
 
-# Clean previous builds
+# Clean previous builds (this script does its own cleanup, so PyInstaller runs without --clean)
 print("\nCleaning previous builds...")
-# Clean PyInstaller build directories
-if os.path.exists('dist'):
-    print("Removing dist directory...")
-    shutil.rmtree('dist')
-if os.path.exists('build'):
-    print("Removing build directory...")
-    shutil.rmtree('build')
+# Move the old PyInstaller directories aside (a quick rename) and delete them on a
+# background thread while PyInstaller runs; it creates fresh dist/ and build/ itself
+print("Removing dist and build directories...")
+stale_dirs = [
+    str(path)
+    for path in ROOT.iterdir()
+    if path.name.startswith(('dist.old-', 'build.old-'))  # left over from an interrupted run
+]
+for output_dir in (DIST, BUILD):
+    stale_path = output_dir.with_name(f"{output_dir.name}.old-{os.getpid()}")
+    try:
+        output_dir.rename(stale_path)
+    except FileNotFoundError:
+        continue
+    stale_dirs.append(str(stale_path))
+cleanup_thread = threading.Thread(target=remove_dirs, args=(stale_dirs,))
+cleanup_thread.start()
 
 # Remove any .spec files created by PyInstaller
-for file in os.listdir(current_dir):
-    if file.endswith('.spec'):
-        print(f"Removing spec file: {file}")
-        os.remove(os.path.join(current_dir, file))
+for spec_file in ROOT.glob('*.spec'):
+    print(f"Removing spec file: {spec_file.name}")
+    spec_file.unlink()
 
 # Clean pycache directories which can cause issues
-for root, dirs, files in os.walk(current_dir):
-    if '__pycache__' in dirs:
-        pycache_path = os.path.join(root, '__pycache__')
-        print(f"Removing pycache: {pycache_path}")
-        shutil.rmtree(pycache_path)
+# (this has to finish before PyInstaller starts reading the sources)
+pycache_paths = list(find_pycaches(str(ROOT), skip=stale_dirs))
+for pycache_path in pycache_paths:
+    print(f"Removing pycache: {pycache_path}")
+# Deletion is I/O bound, so the directories are removed in parallel
+with ThreadPoolExecutor(max_workers=8) as executor:
+    list(executor.map(shutil.rmtree, pycache_paths))
 
-print("Cleanup complete!")
+print("Cleanup complete! (old dist and build are still being removed in the background)")
 
-# Set the script path to the main file
-script_path = os.path.join(current_dir, "coa_analyzer", "coa_analyzer.py")
-print(f"Building from main script: {script_path}")
+# Main script to build
+print(f"Building from main script: {SCRIPT}")
 
 # Run PyInstaller
 print("\nRunning PyInstaller...")
-subprocess.run([
+# Output is kept in build.log for diagnosing failures without a rebuild
+pyinstaller_command = [
     sys.executable, 
     "-m", 
     "PyInstaller",
     "--onefile",       # Single executable
     "--windowed",      # No console window
-    "--clean",         # Clean cache
-    "--distpath", os.path.join(current_dir, "dist"),  # Explicitly set dist path
-    "--workpath", os.path.join(current_dir, "build"), # Explicitly set build path
-    "--specpath", current_dir,  # Explicitly set spec path
+    "--distpath", str(DIST),  # Explicitly set dist path
+    "--workpath", str(BUILD), # Explicitly set build path
+    "--specpath", str(ROOT),  # Explicitly set spec path
     "--name=COA_Analyzer",  # Output name
-    script_path
-], check=True)
+    # Stdlib modules the app never uses; less to unpack at each launch
+    "--exclude-module=tkinter",
+    "--exclude-module=unittest",
+    "--exclude-module=pydoc",
+    str(SCRIPT)
+]
+# PyInstaller advises against --strip on Windows, where a stray strip on PATH can break DLLs
+if sys.platform != "win32" and shutil.which("strip"):
+    pyinstaller_command.insert(-1, "--strip")  # Strip symbols from bundled binaries
+# Bundle bytecode without asserts and docstrings (-OO)
+pyinstaller_env = {**os.environ, "PYTHONOPTIMIZE": "2"}
+run_logged(pyinstaller_command, ROOT / "build.log", env=pyinstaller_env)
+
+# Let the background deletion of the old outputs finish
+cleanup_thread.join()
+
+# Record what was built so an unchanged tree can skip the next build
+hash_file.write_text(build_hash)
 
 print("\n" + "=" * 60)
 print("Build completed!")
-print(f"Executable is in: {os.path.join(current_dir, 'dist', 'COA_Analyzer.exe')}")
+print(f"Executable is in: {exe_path}")
 print("\nNext step: Open simple_installer_script.iss in Inno Setup and click Compile")
 print("=" * 60)
 
@@ -1,31 +1,40 @@
 #!/usr/bin/env python3
 """Test script to verify imports are working."""
 
+import importlib
 import sys
-print(f"Python version: {sys.version}")
-
-try:
-    import PyPDF2
-    print(f"PyPDF2 version: {getattr(PyPDF2, '__version__', 'unknown')}")
-except ImportError as e:
-    print(f"ERROR importing PyPDF2: {e}")
-
-try:
-    import pdf2image
-    print(f"pdf2image imported successfully")
-except ImportError as e:
-    print(f"ERROR importing pdf2image: {e}")
-
-try:
-    import pytesseract
-    print(f"pytesseract version: {getattr(pytesseract, '__version__', 'unknown')}")
-except ImportError as e:
-    print(f"ERROR importing pytesseract: {e}")
-
-try:
-    from PyQt6.QtWidgets import QApplication
-    print("PyQt6 successfully imported")
-except ImportError as e:
-    print(f"ERROR importing PyQt6: {e}")
-
-print("Import test completed") 
\ No newline at end of file
+from concurrent.futures import ThreadPoolExecutor
+
+out = [f"Python version: {sys.version}"]
+
+# Module to import and how to report it once it loads
+MODULES = [
+    ("PyPDF2", lambda m: f"PyPDF2 version: {getattr(m, '__version__', 'unknown')}"),
+    ("pdf2image", lambda m: "pdf2image imported successfully"),
+    ("pytesseract", lambda m: f"pytesseract version: {getattr(m, '__version__', 'unknown')}"),
+    ("PyQt6.QtWidgets", lambda m: "PyQt6 successfully imported"),
+]
+
+
+def probe(name):
+    """Import one module, returning it or the ImportError"""
+    try:
+        return importlib.import_module(name), None
+    except ImportError as e:
+        return None, e
+
+
+# The imports are independent, so load them side by side; results keep list order
+with ThreadPoolExecutor(max_workers=len(MODULES)) as executor:
+    outcomes = list(executor.map(probe, [name for name, _ in MODULES]))
+
+for (name, describe), (module, error) in zip(MODULES, outcomes):
+    if error is None:
+        out.append(describe(module))
+    else:
+        out.append(f"ERROR importing {name.split('.')[0]}: {error}")
+
+out.append("Import test completed")
+# Emit the whole report with a single write
+sys.stdout.write("\n".join(out) + "\n")
+sys.stdout.flush()